@@ -37,9 +37,14 @@ DEFAULT_PINS = {
 # Default SPI settings
 DEFAULT_SPI_BUS = 1
 DEFAULT_SPI_DEV = 1
-DEFAULT_SPI_SPEED = 4_000_000  # 4 MHz
+DEFAULT_SPI_SPEED = 10_000_000  # 10 MHz (SSD1683 write clock is rated to 20 MHz)
 DEFAULT_SPI_MODE = 0b00        # SPI Mode 0
 
+# Temperature (deg C) written to the sensor register in fast mode. The OTP
+# waveforms for hot panels are the shortest, so partial updates finish sooner
+# at the cost of a little more ghosting (cleaned by the next full refresh).
+FAST_TEMPERATURE = 0x5A
+
 
 class EPD42:
     """Driver for WeAct Studio 4.2" E-Paper (SSD1683, 400x300).
@@ -58,7 +63,7 @@ class EPD42:
                   Defaults to Orange Pi Zero 2W WeAct pinout.
             spi_bus: SPI bus number (default 1)
             spi_dev: SPI device number (default 1)
-            spi_speed: SPI clock speed in Hz (default 4MHz)
+            spi_speed: SPI clock speed in Hz (default 10MHz)
             spi_mode: SPI mode (default 0)
             gpiochip: GPIO chip name (default "gpiochip1")
         """
@@ -68,6 +73,7 @@ class EPD42:
         self._partial_count = 0
         self._last_full_refresh = time.time()
         self._full_refresh_interval = 300  # seconds (5 minutes)
+        self._fast = False  # partial updates use the fast waveform (init_fast)
 
         # SPI setup
         self.spi = spidev.SpiDev()
@@ -132,33 +138,35 @@ class EPD42:
         self.cs.set_value(1)
 
     def _send_data_bulk(self, data):
-        """Send bulk data (DC=HIGH, CS held LOW for entire transfer)."""
+        """Send bulk data (DC=HIGH, CS held LOW for entire transfer).
+
+        writebytes2() takes any bytes-like object without converting it to a
+        list and splits it into spidev-sized transfers itself.
+        """
         self.dc.set_value(1)
         self.cs.set_value(0)
-        chunk_size = 4096
-        for i in range(0, len(data), chunk_size):
-            self.spi.writebytes(data[i:i + chunk_size])
+        self.spi.writebytes2(data)
         self.cs.set_value(1)
 
-    def _set_window(self):
-        """Set the RAM window to full screen."""
+    def _set_window(self, x0=0, y0=0, x1=EPD_WIDTH - 1, y1=EPD_HEIGHT - 1):
+        """Set the RAM window (full screen by default). X is in 8-pixel units."""
         self._send_command(0x44)  # RAM X address range
-        self._send_data(0x00)
-        self._send_data(0x31)
+        self._send_data(x0 // 8)
+        self._send_data(x1 // 8)
 
         self._send_command(0x45)  # RAM Y address range
-        self._send_data(0x00)
-        self._send_data(0x00)
-        self._send_data(0x2B)
-        self._send_data(0x01)
+        self._send_data(y0 & 0xFF)
+        self._send_data(y0 >> 8)
+        self._send_data(y1 & 0xFF)
+        self._send_data(y1 >> 8)
 
-    def _set_cursor(self):
-        """Set the RAM cursor to (0, 0)."""
+    def _set_cursor(self, x=0, y=0):
+        """Set the RAM cursor (top-left by default)."""
         self._send_command(0x4E)
-        self._send_data(0x00)
+        self._send_data(x // 8)
         self._send_command(0x4F)
-        self._send_data(0x00)
-        self._send_data(0x00)
+        self._send_data(y & 0xFF)
+        self._send_data(y >> 8)
 
     # --- Display operations ---
 
@@ -207,15 +215,38 @@ class EPD42:
         self._send_data(0x00)    # RED normal
         self._send_data(0x00)    # single chip application
 
+        self._fast = False
         self._partial_count = 0
         self._last_full_refresh = time.time()
 
+    def init_fast(self):
+        """Initialize the display for fast partial refresh.
+
+        Like init_partial(), but the temperature register is overridden with
+        FAST_TEMPERATURE and partial updates stop re-reading the sensor, so
+        the controller picks its shortest waveform. Full refreshes
+        (display(), full_refresh()) still read the real temperature.
+        """
+        self.init_partial()
+
+        self._send_command(0x1A)  # Write temperature register
+        self._send_data(FAST_TEMPERATURE)
+        self._send_data(0x00)
+
+        self._send_command(0x22)  # Load the waveform for that temperature
+        self._send_data(0x91)
+        self._send_command(0x20)
+        self._wait_busy()
+
+        self._fast = True
+
     def display(self, buffer):
         """
         Write image buffer to display and perform full refresh.
 
         Args:
-            buffer: list/bytes of length (width/8 * height) = 15000.
+            buffer: bytes-like object (bytes, bytearray, memoryview, ...)
+                    of length (width/8 * height) = 15000.
                     Each bit: 1=white, 0=black. MSB first.
         """
         self._send_command(0x24)  # Write to NEW RAM
@@ -239,15 +270,28 @@ class EPD42:
         every 5 minutes to clean ghosting. Can also be forced with full_refresh().
 
         Args:
-            buffer: list/bytes of length (width/8 * height) = 15000.
+            buffer: bytes-like object of length (width/8 * height) = 15000.
+        """
+        self.display_window(buffer, 0, 0, self.width - 1, self.height - 1)
+
+    def display_window(self, buffer, x0, y0, x1, y1):
+        """
+        Partial refresh that only transfers a rectangular window of the buffer.
+
+        The whole panel is still updated, but only the bytes inside the
+        window are sent over SPI, so small changes (one text line) go out
+        much faster. Must call init_partial() first.
+
+        Args:
+            buffer: full-screen bytes-like object, as for display_partial().
+            x0, y0, x1, y1: inclusive window in panel pixels. X is widened
+                            to whole bytes (multiples of 8 pixels).
         """
         self._partial_count += 1
 
         # Time-based full refresh to clean ghosting (every 5 min)
         if time.time() - self._last_full_refresh >= self._full_refresh_interval:
-            self.init()
-            self.display(buffer)
-            self.init_partial()
+            self.full_refresh(buffer)
             return
 
         self._send_command(0x3C)  # Border Waveform
@@ -257,27 +301,45 @@ class EPD42:
         self._send_data(0x00)
         self._send_data(0x00)
 
-        self._set_window()
-        self._set_cursor()
+        x0 -= x0 % 8
+        x1 |= 7
+        row_bytes = self.width // 8
+        if (x0, y0, x1, y1) == (0, 0, self.width - 1, self.height - 1):
+            data = buffer
+        else:
+            view = memoryview(buffer)
+            xb0, xb1 = x0 // 8, x1 // 8 + 1
+            data = b"".join(view[y * row_bytes + xb0:y * row_bytes + xb1]
+                            for y in range(y0, y1 + 1))
+
+        self._set_window(x0, y0, x1, y1)
+        self._set_cursor(x0, y0)
 
         self._send_command(0x24)  # Write to NEW RAM only
-        self._send_data_bulk(buffer)
+        self._send_data_bulk(data)
 
         self._send_command(0x22)  # Display Update Control: partial
-        self._send_data(0xFF)
+        self._send_data(0xDF if self._fast else 0xFF)  # 0xDF keeps the set temperature
         self._send_command(0x20)  # Activate Display Update Sequence
         self._wait_busy()
 
         # Sync OLD RAM for next partial
-        self._set_cursor()
+        self._set_cursor(x0, y0)
         self._send_command(0x26)
-        self._send_data_bulk(buffer)
+        self._send_data_bulk(data)
 
     def full_refresh(self, buffer):
-        """Force a full refresh to clean ghosting. Use when display looks messy."""
+        """Force a full refresh to clean ghosting. Use when display looks messy.
+
+        Returns to the same partial mode (normal or fast) afterwards.
+        """
+        fast = self._fast
         self.init()
         self.display(buffer)
-        self.init_partial()
+        if fast:
+            self.init_fast()
+        else:
+            self.init_partial()
 
     def clear(self, color=0xFF):
         """
@@ -286,7 +348,7 @@ class EPD42:
         Args:
             color: 0xFF for white (default), 0x00 for black.
         """
-        buf = [color] * (self.width // 8 * self.height)
+        buf = bytes([color]) * (self.width // 8 * self.height)
         self.display(buf)
 
     def sleep(self):
@@ -304,7 +366,7 @@ class EPD42:
         if image.size != (self.width, self.height):
             image = image.resize((self.width, self.height))
         image = image.convert("1")
-        buffer = list(image.tobytes())
+        buffer = image.tobytes()
         self.display(buffer)
 
     def display_image_partial(self, image):
@@ -317,7 +379,7 @@ class EPD42:
         if image.size != (self.width, self.height):
             image = image.resize((self.width, self.height))
         image = image.convert("1")
-        buffer = list(image.tobytes())
+        buffer = image.tobytes()
         self.display_partial(buffer)
 
     @staticmethod
@@ -329,6 +391,6 @@ class EPD42:
             image: PIL Image (mode "1", size 400x300).
 
         Returns:
-            list of bytes for display().
+            bytes for display().
         """
-        return list(image.convert("1").tobytes())
+        return image.convert("1").tobytes()
@@ -0,0 +1,70 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+etyper_fast.pyx - Compiled versions of the typewriter's per-keystroke loops.
+
+typewriter.py imports this module when it has been built and otherwise uses
+its own pure-Python versions, which behave identically.
+
+Build (done by install.sh):
+  cythonize -i etyper_fast.pyx
+"""
+
+
+def wrap_mono(str para, Py_ssize_t cpl):
+    """Greedy word wrap for a monospace font with cpl characters per line.
+
+    Same contract as typewriter._wrap_mono: breaks after the last space that
+    fits (dropping that one space) and hard-breaks words longer than a line.
+
+    Returns:
+        (lines, starts) where starts[i] is the offset of lines[i] in para.
+    """
+    cdef list lines = []
+    cdef list starts = []
+    cdef Py_ssize_t n = len(para)
+    cdef Py_ssize_t i = 0
+    cdef Py_ssize_t end, sp
+    while True:
+        starts.append(i)
+        end = i + cpl
+        if end >= n:
+            lines.append(para[i:])
+            return lines, starts
+        sp = end
+        while sp > i and para[sp] != u" ":
+            sp -= 1
+        if sp <= i:
+            lines.append(para[i:end])
+            i = end
+        else:
+            lines.append(para[i:sp])
+            i = sp + 1
+
+
+def blit_glyphs(unsigned char[:, :] fb, int[:] rows, int[:] cols, int[:] idx,
+                unsigned char[:, :, :] table, unsigned char fill):
+    """Set the ink pixels of glyphs table[idx[k]] at fb[rows[k], cols[k]] to fill.
+
+    Same contract as typewriter._blit_glyphs; glyphs are clipped to fb and
+    index 0 (blank) is skipped.
+    """
+    cdef Py_ssize_t fb_h = fb.shape[0]
+    cdef Py_ssize_t fb_w = fb.shape[1]
+    cdef Py_ssize_t gh = table.shape[1]
+    cdef Py_ssize_t gw = table.shape[2]
+    cdef Py_ssize_t k, g, r, c, i, j, i0, i1, j0, j1
+    with nogil:
+        for k in range(idx.shape[0]):
+            g = idx[k]
+            if g == 0:
+                continue
+            r = rows[k]
+            c = cols[k]
+            i0 = -r if r < 0 else 0
+            j0 = -c if c < 0 else 0
+            i1 = fb_h - r if r + gh > fb_h else gh
+            j1 = fb_w - c if c + gw > fb_w else gw
+            for i in range(i0, i1):
+                for j in range(j0, j1):
+                    if table[g, i, j]:
+                        fb[r + i, c + j] = fill
@@ -24,21 +24,21 @@ def main():
         row_bytes = W // 8  # 50
 
         tests = [
-            ("ALL WHITE", [0xFF] * (row_bytes * H)),
-            ("ALL BLACK", [0x00] * (row_bytes * H)),
+            ("ALL WHITE", b"\xff" * (row_bytes * H)),
+            ("ALL BLACK", bytes(row_bytes * H)),
             ("TOP BLACK / BOTTOM WHITE",
-             [0x00] * (row_bytes * (H // 2)) + [0xFF] * (row_bytes * (H // 2))),
+             bytes(row_bytes * (H // 2)) + b"\xff" * (row_bytes * (H // 2))),
             ("LEFT BLACK / RIGHT WHITE",
-             sum([[0x00] * (row_bytes // 2) + [0xFF] * (row_bytes // 2)
-                  for _ in range(H)], [])),
+             (bytes(row_bytes // 2) + b"\xff" * (row_bytes // 2)) * H),
         ]
 
+        # The panel stays awake between patterns; one init, one sleep
+        epd.init()
         for name, buf in tests:
             print(f"Test: {name}")
-            epd.init()
             epd.display(buf)
-            epd.sleep()
             time.sleep(5)
+        epd.sleep()
 
         print("All tests complete!")
 
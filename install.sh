@@ -17,11 +17,16 @@ apt-get install -y \
     python3-spidev \
     python3-libgpiod \
     python3-pil \
+    python3-numpy \
     python3-evdev \
+    python3-pyudev \
     python3-dbus \
     python3-gi \
     dnsmasq \
-    openssl
+    openssl \
+    cython3 \
+    python3-dev \
+    gcc
 
 # Disable the system dnsmasq service -- etyper starts its own instance
 # only during file transfer, and the system service would conflict on port 53
@@ -30,6 +35,17 @@ if systemctl is-enabled dnsmasq &>/dev/null; then
     systemctl disable --now dnsmasq
 fi
 
+SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
+
+# Compile the optional etyper_fast extension (typewriter.py falls back to
+# pure Python if it is missing)
+echo "Building etyper_fast extension..."
+if (cd "$SCRIPT_DIR" && python3 -m Cython.Build.Cythonize -i -q etyper_fast.pyx); then
+    rm -rf "$SCRIPT_DIR/build" "$SCRIPT_DIR/etyper_fast.c"
+else
+    echo "WARNING: etyper_fast build failed, using the pure Python fallback"
+fi
+
 # Create documents directory
 DOCS_DIR="$HOME/etyper_docs"
 mkdir -p "$DOCS_DIR"
@@ -39,7 +55,6 @@ echo "Documents directory: $DOCS_DIR"
 read -p "Install as boot service (auto-start on boot)? [y/N] " -n 1 -r
 echo
 if [[ $REPLY =~ ^[Yy]$ ]]; then
-    SCRIPT_DIR="$(cd "$(dirname "$0")" && pwd)"
     SERVICE_FILE="/etc/systemd/system/etyper.service"
 
     # Update service file with correct path
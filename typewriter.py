@@ -27,12 +27,16 @@ Usage:
 import os
 import sys
 import ssl
+import json
 import time
 import signal
 import select
-import textwrap
+import queue
+import bisect
+import functools
 import subprocess
 import threading
+from array import array
 from datetime import datetime
 from http.server import HTTPServer, SimpleHTTPRequestHandler
 from urllib.parse import quote, unquote
@@ -46,6 +50,19 @@ try:
 except ImportError:
     HAS_DBUS = False
 
+try:
+    import pyudev
+    HAS_PYUDEV = True
+except ImportError:
+    HAS_PYUDEV = False
+
+try:
+    import etyper_fast  # compiled wrap/blit loops, see etyper_fast.pyx
+    HAS_FAST = True
+except ImportError:
+    HAS_FAST = False
+
+import numpy as np
 from PIL import Image, ImageDraw, ImageFont
 
 from epd42_driver import EPD42
@@ -310,6 +327,245 @@ if HAS_EVDEV:
 # Default/fallback keymap (US QWERTY)
 KEYMAP = LAYOUTS.get("US QWERTY", {})
 
+# Layouts flattened into (normal, shifted) lists indexed by keycode, so a
+# keypress is a single tables[shift_held][keycode] lookup.
+KEY_TABLE_SIZE = ecodes.KEY_MAX + 1 if HAS_EVDEV else 0
+
+
+def _key_tables(keymap):
+    """Return (normal, shifted) character lists for a layout keymap."""
+    normal = [None] * KEY_TABLE_SIZE
+    shifted = [None] * KEY_TABLE_SIZE
+    for code, (n, s) in keymap.items():
+        normal[code] = n
+        shifted[code] = s
+    return normal, shifted
+
+
+KEY_TABLES = {name: _key_tables(keymap) for name, keymap in LAYOUTS.items()}
+
+
+# --- Text buffer ---
+
+class GapBuffer:
+    """Document text with a movable gap at the edit point.
+
+    Characters before the gap live in ``left``; characters after it live in
+    ``right`` in reverse order. Inserting or deleting at the gap is then a
+    list append/pop instead of a copy of the whole document. Lists of
+    characters are used rather than bytearrays so that non-ASCII layout
+    characters (ö, £, ...) still count as one position each.
+    """
+
+    def __init__(self, text=""):
+        self.left = list(text)
+        self.right = []
+
+    def __len__(self):
+        return len(self.left) + len(self.right)
+
+    def move(self, delta):
+        """Move the gap delta characters to the right (negative = left)."""
+        if delta < 0:
+            n = min(-delta, len(self.left))
+            moved = self.left[len(self.left) - n:]
+            del self.left[len(self.left) - n:]
+            self.right.extend(reversed(moved))
+        elif delta > 0:
+            n = min(delta, len(self.right))
+            moved = self.right[len(self.right) - n:]
+            del self.right[len(self.right) - n:]
+            self.left.extend(reversed(moved))
+
+    def move_to(self, pos):
+        """Move the gap to text offset pos."""
+        self.move(pos - len(self.left))
+
+    def insert(self, s):
+        """Insert s before the gap."""
+        self.left.extend(s)
+
+    def delete_left(self, n=1):
+        """Delete up to n characters before the gap and return them."""
+        n = min(n, len(self.left))
+        removed = self.left[len(self.left) - n:]
+        del self.left[len(self.left) - n:]
+        return "".join(removed)
+
+    def delete_right(self, n=1):
+        """Delete up to n characters after the gap and return them."""
+        n = min(n, len(self.right))
+        removed = self.right[len(self.right) - n:]
+        del self.right[len(self.right) - n:]
+        return "".join(reversed(removed))
+
+    def slice(self, start, end):
+        """Return the text between offsets start and end."""
+        gap = len(self.left)
+        parts = []
+        if start < gap:
+            parts.append("".join(self.left[start:min(end, gap)]))
+        if end > gap:
+            r = len(self.right)
+            lo = max(r - (end - gap), 0)
+            hi = r - max(start - gap, 0)
+            parts.append("".join(reversed(self.right[lo:hi])))
+        return "".join(parts)
+
+    def as_str(self):
+        """Return the whole document as a string (for loading the layout/saving)."""
+        return "".join(self.left) + "".join(reversed(self.right))
+
+    def as_bytes(self):
+        """Return the whole document UTF-8 encoded, ready to write to disk."""
+        return self.as_str().encode("utf-8")
+
+
+# --- Word wrap layout ---
+
+def _wrap_mono(para, cpl):
+    """Greedy word wrap for a monospace font with cpl characters per line.
+
+    Breaks after the last space that fits (dropping that one space) and
+    hard-breaks words longer than a line. Every character has the same
+    width, so no font measurement is needed.
+
+    Returns:
+        (lines, starts) where starts[i] is the offset of lines[i] in para.
+    """
+    lines = []
+    starts = []
+    i = 0
+    n = len(para)
+    while True:
+        starts.append(i)
+        end = i + cpl
+        if end >= n:
+            lines.append(para[i:])
+            return lines, starts
+        sp = para.rfind(" ", i, end + 1)
+        if sp <= i:
+            lines.append(para[i:end])
+            i = end
+        else:
+            lines.append(para[i:sp])
+            i = sp + 1
+
+
+# --- Glyph blitting ---
+
+def _blit_glyphs(fb, rows, cols, idx, table, fill):
+    """Set the ink pixels of glyphs table[idx[k]] at fb[rows[k], cols[k]] to fill.
+
+    rows, cols and idx are array("i") sequences; table is a (n, h, w) uint8
+    array of 0/1 glyph masks where index 0 is the blank glyph and is skipped.
+    Glyphs are clipped to fb.
+    """
+    fb_h, fb_w = fb.shape
+    _, h, w = table.shape
+    for r, c, g in zip(rows, cols, idx):
+        if g == 0:
+            continue
+        ink = table[g].view(bool)
+        if r < 0 or c < 0 or r + h > fb_h or c + w > fb_w:
+            # Clip glyphs hanging off the screen edge
+            r0, c0 = max(r, 0), max(c, 0)
+            r1, c1 = min(r + h, fb_h), min(c + w, fb_w)
+            if r0 >= r1 or c0 >= c1:
+                continue
+            fb[r0:r1, c0:c1][ink[r0 - r:r1 - r, c0 - c:c1 - c]] = fill
+        else:
+            fb[r:r + h, c:c + w][ink] = fill
+
+
+if HAS_FAST:
+    _wrap_mono = etyper_fast.wrap_mono
+    _blit_glyphs = etyper_fast.blit_glyphs
+
+
+class _WrapLayout:
+    """Word-wrapped view of the document, cached between renders.
+
+    Each paragraph (text between newlines) is wrapped on its own, so an edit
+    only rewraps the paragraphs it touches and splices the result into
+    ``lines`` instead of rewrapping the whole document.
+    """
+
+    def __init__(self, text, cpl, version):
+        self.cpl = cpl
+        self.version = version
+        self.length = 0
+        self.para_starts = [0]      # text offset of each paragraph
+        self.para_first_line = [0]  # index into lines of each paragraph's first line
+        self.para_breaks = [[0]]    # per paragraph: offsets where wrapped lines start
+        self.lines = [""]
+        self.splice(0, 0, text)
+
+    def paragraph_at(self, pos):
+        """Index of the paragraph containing text offset pos."""
+        return bisect.bisect_right(self.para_starts, pos) - 1
+
+    def para_end(self, p):
+        """Text offset just past paragraph p (i.e. of its trailing \\n)."""
+        if p + 1 < len(self.para_starts):
+            return self.para_starts[p + 1] - 1
+        return self.length
+
+    def splice(self, p0, p1, chunk):
+        """Replace paragraphs p0..p1 (inclusive) with the wrapped text of chunk."""
+        start = self.para_starts[p0]
+        old_end = self.para_end(p1)
+        first_line = self.para_first_line[p0]
+        if p1 + 1 < len(self.para_first_line):
+            end_line = self.para_first_line[p1 + 1]
+        else:
+            end_line = len(self.lines)
+
+        new_starts, new_first, new_breaks, new_lines = [], [], [], []
+        pos = start
+        line = first_line
+        for para in chunk.split("\n"):
+            wrapped, breaks = _wrap_mono(para, self.cpl)
+            new_starts.append(pos)
+            new_first.append(line)
+            new_breaks.append(breaks)
+            new_lines.extend(wrapped)
+            pos += len(para) + 1
+            line += len(wrapped)
+
+        delta = len(chunk) - (old_end - start)
+        line_delta = line - end_line
+        self.para_starts[p0:] = new_starts + [
+            s + delta for s in self.para_starts[p1 + 1:]]
+        self.para_first_line[p0:] = new_first + [
+            n + line_delta for n in self.para_first_line[p1 + 1:]]
+        self.para_breaks[p0:p1 + 1] = new_breaks
+        self.lines[first_line:end_line] = new_lines
+        self.length += delta
+
+    def locate(self, pos):
+        """Convert a text offset to a wrapped (line, col).
+
+        A space consumed by wrapping, like the \n ending a paragraph, lands
+        at the end of the line before it.
+        """
+        pos = min(pos, self.length)
+        p = self.paragraph_at(pos)
+        off = pos - self.para_starts[p]
+        breaks = self.para_breaks[p]
+        sub = bisect.bisect_right(breaks, off) - 1
+        return self.para_first_line[p] + sub, off - breaks[sub]
+
+    def position(self, target_line, target_col):
+        """Convert a wrapped (line, col) back to a text offset."""
+        if target_line >= len(self.lines):
+            return self.length
+
+        p = bisect.bisect_right(self.para_first_line, target_line) - 1
+        sub = target_line - self.para_first_line[p]
+        col = min(target_col, len(self.lines[target_line]))
+        return self.para_starts[p] + self.para_breaks[p][sub] + col
+
 
 if HAS_DBUS:
     class _BtAutoAcceptAgent(dbus.service.Object):
@@ -356,26 +612,49 @@ class EtyperApp:
     """Main typewriter application with cursor movement."""
 
     def __init__(self):
-        self.text = ""
-        self.cursor = 0  # character index in self.text
+        self.buf = GapBuffer()
+        self.cursor = 0  # character index into the document
         self.doc_path = None
         self.running = False
         self.dirty = False
         self.last_save_time = time.time()
         self.epd = None
         self.keyboard = None
+        self._epoll = None  # epoll set watching the keyboard (and udev) fds
+        self._udev_monitor = None  # pyudev.Monitor for input hotplug, if available
+        self._keyboard_id = None  # (name, phys) of the last attached keyboard
+        self._rescan_keyboard = True  # scan devices on next _ensure_keyboard()
         self.font = None
         self.shift_held = False
         self.ctrl_held = False
         self.active_layout = "US QWERTY"
-        self.keymap = KEYMAP
+        self.key_tables = _key_tables(KEYMAP)  # (normal, shifted) for the active layout
         self.chars_per_line = 30
         self.lines_per_page = 20
         self.needs_display_update = True
         self.scroll_offset = 0  # first visible wrapped-line index
+        self._text_version = 0  # bumped whenever the text is replaced wholesale
+        self._wrap_cache = None  # _WrapLayout for the current text
+        self._pending_edit = None  # (p0, p1, delta) edited since last layout sync
+        self._out = None  # persistent landscape framebuffer render() draws on
+        self._glyph_index = {}  # char -> row of self._glyph_table, see _glyph()
+        self._glyph_table = None  # (n, h, w) uint8 rotated glyph masks, row 0 blank
+        self._glyph_box = (0, 0, 0, 0)  # portrait (left, top, right, bottom) of every mask
+        self._shown = None  # (scroll, lines, cursor cell, status) of last render
+        self._dirty_window = None  # panel window changed by last render, None = all
+        self._spi_lock = threading.RLock()  # held for every use of self.epd
+        self._flush_q = queue.Queue(maxsize=1)  # newest (gen, frame, window) to show
+        self._flush_thread = None  # background thread running _flusher()
+        self._frame_gen = 0  # bumped to invalidate frames queued before a repaint
+        self._dispatch = {}  # keycode -> key handler, see _build_dispatch()
+        self._ctrl_dispatch = {}  # keycode -> shortcut handler while Ctrl is held
+        self._build_dispatch()
         self._bt_agent = None  # reusable D-Bus BT agent
         self._bt_bus = None  # reusable D-Bus system bus
         self._dbus_mainloop_set = False  # ensure mainloop set only once
+        self._docs_cache = None  # (docs dir mtime, sorted doc paths)
+        self._journal = []  # ("i", pos, text) / ("d", pos, count) since last autosave
+        self._journal_size = 0  # bytes in the on-disk journal
 
     def _find_font(self):
         """Find a suitable monospace font."""
@@ -398,23 +677,217 @@ class EtyperApp:
         self.chars_per_line = max(1, usable_w // char_w)
         self.lines_per_page = max(1, usable_h // self.line_h) - 1  # reserve status bar
 
+    def _setup_canvas(self):
+        """Allocate the framebuffer render() reuses for every frame."""
+        self._out = self._new_screen()
+        self._build_glyphs()
+
+    # Screens are laid out in portrait coordinates but drawn straight into a
+    # landscape framebuffer for the panel: portrait (x, y) is landscape
+    # (PORTRAIT_H - 1 - y, x), i.e. what ROTATE_270 of the portrait image
+    # would produce, without ever building or rotating a portrait image.
+    #
+    # A framebuffer is a (PORTRAIT_W, PORTRAIT_H) uint8 array indexed
+    # [landscape row, landscape column] holding one pixel per byte, 1 = white
+    # and 0 = black. Glyph columns are not byte-aligned on the panel, so
+    # pixels stay unpacked while drawing and _pack() produces the 1-bit panel
+    # buffer in one step.
+
+    @staticmethod
+    def _new_screen():
+        """Return a blank (white) landscape framebuffer."""
+        return np.ones((PORTRAIT_W, PORTRAIT_H), dtype=np.uint8)
+
+    @staticmethod
+    def _pack(fb):
+        """Pack a framebuffer into the panel's 1-bit, MSB-first buffer."""
+        return np.packbits(fb, axis=1).tobytes()
+
+    @staticmethod
+    def _fill_rect(fb, x0, y0, x1, y1, fill):
+        """Fill the inclusive portrait rectangle (x0, y0)-(x1, y1) on fb."""
+        fb[max(0, x0):x1 + 1, max(0, PORTRAIT_H - 1 - y1):PORTRAIT_H - y0] = fill
+
+    def _build_glyphs(self):
+        """Pre-rasterize printable ASCII so render() can paste glyphs instead of
+        running FreeType for every character of every frame."""
+        self._glyph_index = {}
+        self._glyph_box = (0, 0, 0, 0)
+        self._rebuild_glyph_table([chr(code) for code in range(32, 127)])
+
+    def _rebuild_glyph_table(self, chars):
+        """Rasterize chars into self._glyph_table, growing the shared box to fit.
+
+        Every mask covers the same box relative to the character cell, so a
+        glyph is drawn at a fixed offset from its cell (see _blit_text) and
+        the whole table can be handed to _blit_glyphs as one array.
+        """
+        box_l, box_t, box_r, box_b = self._glyph_box
+        bboxes = []
+        for ch in chars:
+            left, top, right, bottom = self.font.getbbox(ch)
+            if right > left and bottom > top:
+                bboxes.append((ch, left, top))
+                box_l, box_t = min(box_l, left), min(box_t, top)
+                box_r, box_b = max(box_r, right), max(box_b, bottom)
+            else:
+                bboxes.append((ch, None, None))
+        self._glyph_box = (box_l, box_t, box_r, box_b)
+
+        # Rotated for the landscape panel: portrait width becomes rows
+        table = np.zeros((len(chars) + 1, box_r - box_l, box_b - box_t), dtype=np.uint8)
+        self._glyph_index = {}
+        for ch, left, top in bboxes:
+            if left is None:
+                self._glyph_index[ch] = 0  # blank
+                continue
+            mask = Image.new("1", (box_r - box_l, box_b - box_t), 0)
+            ImageDraw.Draw(mask).text((-box_l, -box_t), ch, font=self.font, fill=1)
+            idx = len(self._glyph_index) + 1
+            table[idx] = np.array(mask.transpose(Image.Transpose.ROTATE_270))
+            self._glyph_index[ch] = idx
+        self._glyph_table = table
+
+    def _glyph(self, ch):
+        """Return the row of self._glyph_table for ch, rasterizing it on first use.
+
+        Row 0 is the blank glyph (space and other characters without ink).
+        """
+        idx = self._glyph_index.get(ch)
+        if idx is None:
+            # Rare (non-ASCII): rebuild so the shared box also fits this glyph
+            self._rebuild_glyph_table(list(self._glyph_index) + [ch])
+            idx = self._glyph_index[ch]
+        return idx
+
+    def _blit_text(self, fb, x, y, s, fill=0):
+        """Set the ink of cached glyphs for s at portrait (x, y) on fb to fill,
+        one char_w cell per character."""
+        n = len(s)
+        if not n:
+            return
+        box_l, _, _, box_b = self._glyph_box
+        idx = array("i", map(self._glyph, s))
+        rows = array("i", range(x + box_l, x + box_l + n * self.char_w, self.char_w))
+        cols = array("i", [PORTRAIT_H - y - box_b]) * n
+        _blit_glyphs(fb, rows, cols, idx, self._glyph_table, fill)
+
     def _find_keyboard(self):
         """Find a USB keyboard device via evdev."""
         if not HAS_EVDEV:
             return None
 
-        devices = [InputDevice(path) for path in list_devices()]
-        for dev in devices:
-            caps = dev.capabilities(verbose=False)
-            if ecodes.EV_KEY in caps:
-                keys = caps[ecodes.EV_KEY]
-                if ecodes.KEY_A in keys and ecodes.KEY_ENTER in keys:
-                    print(f"Keyboard found: {dev.name} ({dev.path})")
-                    return dev
+        for path in list_devices():
+            dev = InputDevice(path)
+            if self._is_keyboard(dev):
+                print(f"Keyboard found: {dev.name} ({dev.path})")
+                return dev
+            dev.close()
 
         print("WARNING: No keyboard found. Waiting for connection...")
         return None
 
+    @staticmethod
+    def _is_keyboard(dev):
+        """Check whether an evdev device has the keys of a text keyboard."""
+        caps = dev.capabilities(verbose=False)
+        if ecodes.EV_KEY in caps:
+            keys = caps[ecodes.EV_KEY]
+            return ecodes.KEY_A in keys and ecodes.KEY_ENTER in keys
+        return False
+
+    def _ensure_keyboard(self):
+        """Find and attach a keyboard if none is connected.
+
+        With a udev hotplug monitor running, devices are only scanned once
+        after startup or a disconnect; new keyboards are then picked up by
+        _handle_hotplug() instead of rescanning every second.
+
+        Returns True if a keyboard is available.
+        """
+        if self.keyboard is None and (self._udev_monitor is None or self._rescan_keyboard):
+            self._rescan_keyboard = False
+            dev = self._find_keyboard()
+            if dev is not None:
+                self._attach_keyboard(dev)
+        return self.keyboard is not None
+
+    def _attach_keyboard(self, dev):
+        """Use dev as the keyboard and watch its fd."""
+        self._epoll.register(dev.fd, select.EPOLLIN)
+        self.keyboard = dev
+        self._keyboard_id = (dev.name, dev.phys)
+
+    def _detach_keyboard(self):
+        """Forget a disconnected keyboard and stop watching its fd."""
+        self._rescan_keyboard = True
+        if self.keyboard is None:
+            return
+        try:
+            self._epoll.unregister(self.keyboard.fd)
+        except (OSError, ValueError):
+            pass
+        try:
+            self.keyboard.close()
+        except OSError:
+            pass
+        self.keyboard = None
+
+    def _poll_keyboard(self, timeout):
+        """Wait up to timeout seconds for keyboard input. Returns True if readable.
+
+        udev hotplug events arriving meanwhile are handled on the way.
+        """
+        keyboard = self.keyboard
+        ready = False
+        for fd, _ in self._epoll.poll(timeout):
+            if self._udev_monitor is not None and fd == self._udev_monitor.fileno():
+                self._handle_hotplug()
+            elif keyboard is not None and fd == keyboard.fd:
+                ready = True
+        # A hotplug event in the same batch may have detached or replaced the
+        # keyboard; its readiness says nothing about the current one
+        return ready and self.keyboard is keyboard
+
+    def _start_hotplug_monitor(self):
+        """Watch udev for input devices being added/removed (needs pyudev)."""
+        try:
+            monitor = pyudev.Monitor.from_netlink(pyudev.Context())
+            monitor.filter_by("input")
+            monitor.start()
+        except Exception as e:
+            print(f"udev monitor unavailable, polling for keyboards: {e}")
+            return
+        self._epoll.register(monitor.fileno(), select.EPOLLIN)
+        self._udev_monitor = monitor
+
+    def _handle_hotplug(self):
+        """Attach a newly plugged keyboard or drop the one that was unplugged."""
+        while True:
+            device = self._udev_monitor.poll(timeout=0)
+            if device is None:
+                return
+            node = device.device_node
+            if not node or not node.startswith("/dev/input/event"):
+                continue
+
+            if device.action == "remove":
+                if self.keyboard is not None and self.keyboard.path == node:
+                    print("Keyboard disconnected, waiting...")
+                    self._detach_keyboard()
+            elif device.action == "add" and self.keyboard is None:
+                try:
+                    dev = InputDevice(node)
+                except OSError:
+                    self._rescan_keyboard = True  # node not ready yet
+                    continue
+                # Same keyboard coming back: skip probing its capabilities
+                if (dev.name, dev.phys) == self._keyboard_id or self._is_keyboard(dev):
+                    print(f"Keyboard found: {dev.name} ({dev.path})")
+                    self._attach_keyboard(dev)
+                else:
+                    dev.close()
+
     # --- Layout management ---
 
     def _load_layout_pref(self):
@@ -424,11 +897,11 @@ class EtyperApp:
             name = open(LAYOUT_CONFIG_FILE).read().strip()
             if name in LAYOUTS:
                 self.active_layout = name
-                self.keymap = LAYOUTS[name]
+                self.key_tables = KEY_TABLES[name]
                 print(f"Layout: {name}")
                 return
         self.active_layout = "US QWERTY"
-        self.keymap = LAYOUTS.get("US QWERTY", KEYMAP)
+        self.key_tables = KEY_TABLES["US QWERTY"]
 
     def _save_layout_pref(self):
         """Save current keyboard layout preference to disk."""
@@ -447,53 +920,48 @@ class EtyperApp:
         selected = LAYOUT_NAMES.index(self.active_layout) if self.active_layout in LAYOUT_NAMES else 0
 
         def render_picker(sel_idx):
-            img = Image.new("1", (PORTRAIT_W, PORTRAIT_H), 255)
-            draw = ImageDraw.Draw(img)
+            img = self._new_screen()
 
             title = "-- Keyboard Layout --"
-            tw = int(self.font.getlength(title))
-            draw.text(((PORTRAIT_W - tw) // 2, MARGIN_Y + 4), title, font=self.font, fill=0)
-            draw.line([(MARGIN_X, MARGIN_Y + self.line_h + 6),
-                       (PORTRAIT_W - MARGIN_X, MARGIN_Y + self.line_h + 6)], fill=0)
+            tw = len(title) * self.char_w
+            self._blit_text(img, (PORTRAIT_W - tw) // 2, MARGIN_Y + 4, title)
+            line_y = MARGIN_Y + self.line_h + 6
+            self._fill_rect(img, MARGIN_X, line_y, PORTRAIT_W - MARGIN_X, line_y, 0)
 
             y = MARGIN_Y + self.line_h + 14
             for i, name in enumerate(LAYOUT_NAMES):
                 label = f"> {name}" if i == sel_idx else f"  {name}"
                 if i == sel_idx:
-                    draw.rectangle(
-                        [MARGIN_X - 2, y - 1,
-                         PORTRAIT_W - MARGIN_X + 2, y + self.cell_h],
-                        fill=0,
-                    )
-                    draw.text((MARGIN_X + 2, y), label, font=self.font, fill=1)
+                    self._fill_rect(img, MARGIN_X - 2, y - 1,
+                                    PORTRAIT_W - MARGIN_X + 2, y + self.cell_h, 0)
+                    self._blit_text(img, MARGIN_X + 2, y, label, fill=1)
                 else:
-                    draw.text((MARGIN_X + 2, y), label, font=self.font, fill=0)
+                    self._blit_text(img, MARGIN_X + 2, y, label)
                 y += self.line_h + 4
 
             hint = "Enter=select  Esc=cancel"
-            hw = int(self.font.getlength(hint))
+            hw = len(hint) * self.char_w
             hy = PORTRAIT_H - MARGIN_Y - self.cell_h - 2
-            draw.line([(MARGIN_X, hy - 2), (PORTRAIT_W - MARGIN_X, hy - 2)], fill=0)
-            draw.text(((PORTRAIT_W - hw) // 2, hy), hint, font=self.font, fill=0)
+            self._fill_rect(img, MARGIN_X, hy - 2, PORTRAIT_W - MARGIN_X, hy - 2, 0)
+            self._blit_text(img, (PORTRAIT_W - hw) // 2, hy, hint)
 
-            return img.transpose(Image.Transpose.ROTATE_270)
+            return self._pack(img)
 
         # Show picker with full refresh
-        self.epd.init()
-        self.epd.display(list(render_picker(selected).tobytes()))
-        self.epd.init_partial()
+        with self._spi_lock:
+            self._drop_frames()
+            self.epd.init()
+            self.epd.display(render_picker(selected))
+            self.epd.init_fast()
 
         # Input loop
         ctrl_held = False
         while self.running:
-            if self.keyboard is None:
-                self.keyboard = self._find_keyboard()
-                if self.keyboard is None:
-                    time.sleep(1)
-                    continue
+            if not self._ensure_keyboard():
+                self._poll_keyboard(1.0)
+                continue
             try:
-                r, _, _ = select.select([self.keyboard.fd], [], [], 1.0)
-                if not r:
+                if not self._poll_keyboard(1.0):
                     continue
                 for event in self.keyboard.read():
                     if event.type != ecodes.EV_KEY or event.value == 0:
@@ -506,15 +974,17 @@ class EtyperApp:
 
                     if code == ecodes.KEY_UP:
                         selected = (selected - 1) % len(LAYOUT_NAMES)
-                        self.epd.display_image_partial(render_picker(selected))
+                        with self._spi_lock:
+                            self.epd.display_partial(render_picker(selected))
 
                     elif code == ecodes.KEY_DOWN:
                         selected = (selected + 1) % len(LAYOUT_NAMES)
-                        self.epd.display_image_partial(render_picker(selected))
+                        with self._spi_lock:
+                            self.epd.display_partial(render_picker(selected))
 
                     elif code == ecodes.KEY_ENTER:
                         self.active_layout = LAYOUT_NAMES[selected]
-                        self.keymap = LAYOUTS[self.active_layout]
+                        self.key_tables = KEY_TABLES[self.active_layout]
                         self._save_layout_pref()
                         print(f"Layout changed to: {self.active_layout}")
                         self._resume_typewriter_display()
@@ -526,7 +996,7 @@ class EtyperApp:
                         return
 
             except OSError:
-                self.keyboard = None
+                self._detach_keyboard()
                 time.sleep(1)
 
     # --- Document management ---
@@ -557,48 +1027,189 @@ class EtyperApp:
         else:
             self.doc_path = self._get_last_doc_path()
 
+        self._journal = []
+        self._journal_size = 0
         if self.doc_path and os.path.exists(self.doc_path):
-            with open(self.doc_path, "r") as f:
-                self.text = f.read()
+            with open(self.doc_path, "r", encoding="utf-8") as f:
+                self.buf = GapBuffer(f.read())
             print(f"Opened: {self.doc_path}")
+            recovered = self._replay_journal()
         else:
             self.doc_path = self._new_doc_path()
-            self.text = ""
+            self.buf = GapBuffer()
+            recovered = None
             print(f"New document: {self.doc_path}")
 
-        self.cursor = len(self.text)  # cursor at end
+        self._text_version += 1
+        self.cursor = len(self.buf)  # cursor at end
         self._set_last_doc(self.doc_path)
         self.dirty = False
 
-    def save_document(self):
+        if recovered is not None:
+            # Fold the journal back into the document file so new autosaves
+            # never append behind a torn line.
+            self.save_document()
+            if recovered:
+                print(f"Recovered {recovered} edits from journal")
+
+    def save_document(self, sync=False):
+        """Write the whole document atomically and drop its journal.
+
+        The text goes to a temporary file that replaces the document, so a
+        crash mid-write never leaves a truncated file. With sync=True the
+        data is also fsync'd (used on shutdown).
+        """
         if self.doc_path:
-            with open(self.doc_path, "w") as f:
-                f.write(self.text)
+            new_file = not os.path.exists(self.doc_path)
+            dir_mtime = os.stat(DOCS_DIR).st_mtime_ns
+            tmp_path = self.doc_path + ".tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(self.buf.as_bytes())
+                if sync:
+                    f.flush()
+                    os.fsync(f.fileno())
+            # A crash between these two steps leaves a journal whose base no
+            # longer matches the new file; _replay_journal() then skips it.
+            os.replace(tmp_path, self.doc_path)
+            self._discard_journal()
+            if new_file:
+                self._docs_cache = None  # first save creates a new file
+            else:
+                self._refresh_docs_cache(dir_mtime)
             self.dirty = False
             self.last_save_time = time.time()
 
+    # --- Autosave journal ---
+    #
+    # Autosave appends the edits made since the previous autosave to
+    # <doc>.journal (one JSON [op, pos, data] per line) instead of rewriting
+    # the whole document. The first line, ["base", size, mtime_ns], records
+    # the document file the edits apply to. Explicit saves, document switches
+    # and shutdown write the full file and remove the journal; a journal left
+    # behind by a crash is replayed on the next load if its base still
+    # matches the file.
+
+    def _journal_path(self):
+        return self.doc_path + ".journal"
+
+    def _write_journal(self):
+        """Append edits since the last autosave to the document's journal."""
+        # Until the document file exists there is nothing to replay onto,
+        # and a journal larger than the document is cheaper to fold back in.
+        if not os.path.exists(self.doc_path) or self._journal_size > len(self.buf):
+            self.save_document()
+            return
+
+        entries = self._journal
+        new_journal = not self._journal_size
+        if new_journal:
+            entries = [self._journal_base()] + entries
+        data = "".join(json.dumps(entry) + "\n" for entry in entries)
+        dir_mtime = os.stat(DOCS_DIR).st_mtime_ns
+        with open(self._journal_path(), "a", encoding="utf-8") as f:
+            f.write(data)
+        if new_journal:
+            self._refresh_docs_cache(dir_mtime)
+        self._journal_size += len(data)
+        self._journal = []
+        self.dirty = False
+        self.last_save_time = time.time()
+
+    def _journal_base(self):
+        """Return the ["base", size, mtime_ns] header for the document file."""
+        st = os.stat(self.doc_path)
+        return ["base", st.st_size, st.st_mtime_ns]
+
+    def _discard_journal(self):
+        """Forget journaled edits once they are part of the document file."""
+        self._journal = []
+        self._journal_size = 0
+        try:
+            os.remove(self._journal_path())
+        except FileNotFoundError:
+            pass
+
+    def _replay_journal(self):
+        """Apply a journal left by a previous session to self.buf.
+
+        Returns the number of edits applied, or None if there is no journal.
+        """
+        path = self._journal_path()
+        if not os.path.exists(path):
+            return None
+
+        count = 0
+        with open(path, encoding="utf-8") as f:
+            try:
+                base = json.loads(f.readline())
+            except ValueError:
+                base = None
+            if base != self._journal_base():
+                # Already folded in (crash after the save's replace) or torn
+                print("Ignoring journal that does not match the document")
+                return 0
+            for line in f:
+                try:
+                    op, pos, data = json.loads(line)
+                except ValueError:
+                    break  # torn last line from a crash mid-append
+                self.buf.move_to(pos)
+                if op == "d":
+                    self.buf.delete_right(data)
+                else:
+                    self.buf.insert(data)
+                count += 1
+        return count
+
     def new_document(self):
         self.save_document()
+        self._docs_cache = None
         self.doc_path = self._new_doc_path()
-        self.text = ""
+        self.buf = GapBuffer()
+        self._text_version += 1
         self.cursor = 0
         self.scroll_offset = 0
         self._set_last_doc(self.doc_path)
         self.dirty = False
         self.needs_display_update = True
 
+    def _refresh_docs_cache(self, dir_mtime):
+        """Keep the listing cache valid after changing non-document files.
+
+        Saves and journals create and remove files in DOCS_DIR, which bumps
+        its mtime without changing the list of documents. dir_mtime is the
+        DOCS_DIR mtime taken just before that change: the cache is only
+        carried over if it was still fresh then, so changes made by anything
+        else are not masked.
+        """
+        if self._docs_cache is None:
+            return
+        if self._docs_cache[0] == dir_mtime:
+            self._docs_cache = (os.stat(DOCS_DIR).st_mtime_ns, self._docs_cache[1])
+        else:
+            self._docs_cache = None
+
     def _list_docs(self):
-        """Return sorted list of all .txt document paths in the docs directory."""
+        """Return sorted list of all .txt document paths in the docs directory.
+
+        The listing is cached and only re-read when the directory's mtime
+        changes (or the cache was invalidated after creating a document).
+        """
         self._ensure_docs_dir()
-        docs = sorted(
-            f for f in os.listdir(DOCS_DIR)
-            if f.endswith(".txt") and f.startswith("doc_")
-        )
-        return [os.path.join(DOCS_DIR, f) for f in docs]
+        mtime = os.stat(DOCS_DIR).st_mtime_ns
+        if self._docs_cache is None or self._docs_cache[0] != mtime:
+            docs = sorted(
+                f for f in os.listdir(DOCS_DIR)
+                if f.endswith(".txt") and f.startswith("doc_")
+            )
+            self._docs_cache = (mtime, [os.path.join(DOCS_DIR, f) for f in docs])
+        return self._docs_cache[1]
 
     def _switch_document(self, direction):
         """Switch to the next (+1) or previous (-1) document."""
-        self.save_document()
+        # A fresh Ctrl+N document has no file yet; save it so it is listed
+        if self.dirty or self._journal_size or not os.path.exists(self.doc_path):
+            self.save_document()
         docs = self._list_docs()
         if not docs:
             return
@@ -619,6 +1230,72 @@ class EtyperApp:
 
     # --- Text wrapping with cursor tracking ---
 
+    def _layout(self):
+        """Return the wrap layout for the current text, bringing it up to date.
+
+        Rebuilds it if the text was replaced wholesale, otherwise rewraps the
+        paragraphs touched by edits since the last call in a single splice.
+        """
+        cache = self._wrap_cache
+        if (cache is None or cache.version != self._text_version
+                or cache.cpl != self.chars_per_line):
+            cache = _WrapLayout(self.buf.as_str(), self.chars_per_line,
+                                self._text_version)
+            self._wrap_cache = cache
+            self._pending_edit = None
+        elif self._pending_edit is not None:
+            p0, p1, delta = self._pending_edit
+            self._pending_edit = None
+            chunk_start = cache.para_starts[p0]
+            chunk_end = cache.para_end(p1) + delta
+            cache.splice(p0, p1, self.buf.slice(chunk_start, chunk_end))
+        return cache
+
+    def _replace_text(self, start, end, s):
+        """Replace text[start:end] with s.
+
+        The gap buffer's gap is moved to the edit point first, so afterwards
+        it sits right after s. The wrap layout is not touched here: the
+        affected paragraphs are only recorded, so a burst of keystrokes read
+        in one main-loop pass is rewrapped once by the next _layout() call.
+        """
+        cache = self._wrap_cache
+        if (cache is not None and cache.version == self._text_version
+                and cache.cpl == self.chars_per_line):
+            self._note_edit(cache, start, end, len(s))
+
+        if end > start:
+            self._journal.append(("d", start, end - start))
+        if s:
+            self._journal.append(("i", start, s))
+
+        self.buf.move_to(start)
+        self.buf.delete_right(end - start)
+        self.buf.insert(s)
+        self.dirty = True
+
+    def _note_edit(self, layout, start, end, inserted):
+        """Merge an edit of text[start:end] into the pending paragraph range.
+
+        The pending range is kept as paragraph indices into the (stale)
+        layout plus the net change in length inside it. Offsets before the
+        range are unchanged; offsets after it are shifted by that change.
+        """
+        if self._pending_edit is None:
+            p0 = layout.paragraph_at(start)
+            p1 = layout.paragraph_at(end)
+            delta = 0
+        else:
+            p0, p1, delta = self._pending_edit
+            lo = layout.para_starts[p0]
+            hi = layout.para_end(p1) + delta
+            for pos in (start, end):
+                if pos < lo:
+                    p0 = min(p0, layout.paragraph_at(pos))
+                elif pos > hi:
+                    p1 = max(p1, layout.paragraph_at(pos - delta))
+        self._pending_edit = (p0, p1, delta + inserted - (end - start))
+
     def _wrap_with_cursor(self):
         """Word-wrap text and track which wrapped line/column the cursor is on.
 
@@ -627,81 +1304,19 @@ class EtyperApp:
             cursor_line is the 0-based index into lines, cursor_col is the
             character offset within that line.
         """
-        cpl = self.chars_per_line
-        lines = []
-        char_to_pos = {}
-        text = self.text
-
-        line_idx = 0
-        para_start = 0
-        paragraphs = text.split("\n")
-
-        for p_idx, para in enumerate(paragraphs):
-            if para == "":
-                lines.append("")
-                # Map the \n after this empty paragraph to start of this line
-                if p_idx < len(paragraphs) - 1:
-                    char_to_pos[para_start] = (line_idx, 0)
-                line_idx += 1
-                para_start += 1  # empty string + \n
-                continue
-
-            # Wrap this paragraph
-            wrapped = textwrap.wrap(para, width=cpl,
-                                    break_long_words=True,
-                                    break_on_hyphens=False)
-            if not wrapped:
-                wrapped = [""]
-
-            # Map character positions within paragraph to wrapped lines
-            para_char = 0
-            for w_line in wrapped:
-                for col, ch in enumerate(w_line):
-                    char_to_pos[para_start + para_char] = (line_idx, col)
-                    para_char += 1
-                # Account for the space that was consumed by wrapping
-                if para_char < len(para) and para[para_char] == " ":
-                    char_to_pos[para_start + para_char] = (line_idx, len(w_line))
-                    para_char += 1
-                lines.append(w_line)
-                line_idx += 1
-
-            # Map the \n that ends this paragraph (cursor at \n = end of line)
-            if p_idx < len(paragraphs) - 1:
-                newline_pos = para_start + len(para)
-                char_to_pos[newline_pos] = (line_idx - 1, len(lines[-1]))
-
-            para_start += len(para) + 1  # +1 for \n
-
-        # Handle empty document
-        if not lines:
-            lines = [""]
-
-        # Find cursor position
-        if self.cursor >= len(text):
-            # Cursor at end of text
-            if lines:
-                cursor_line = len(lines) - 1
-                cursor_col = len(lines[-1])
-            else:
-                cursor_line = 0
-                cursor_col = 0
-        elif self.cursor in char_to_pos:
-            cursor_line, cursor_col = char_to_pos[self.cursor]
-        else:
-            # Fallback: cursor at end
-            cursor_line = len(lines) - 1
-            cursor_col = len(lines[-1])
-
-        return lines, cursor_line, cursor_col
+        layout = self._layout()
+        cursor_line, cursor_col = layout.locate(self.cursor)
+        return layout.lines, cursor_line, cursor_col
 
     # --- Rendering ---
 
     def render(self):
-        """Render the current text to a PIL Image in portrait orientation."""
-        img = Image.new("1", (PORTRAIT_W, PORTRAIT_H), 255)
-        draw = ImageDraw.Draw(img)
+        """Render the current text and return it as a packed panel buffer.
 
+        Drawing goes straight onto a persistent landscape framebuffer; only
+        the rows that differ from the previous render (text, cursor or status
+        bar) are cleared and redrawn before the frame is packed.
+        """
         lines, cursor_line, cursor_col = self._wrap_with_cursor()
 
         visible = self.lines_per_page
@@ -713,43 +1328,149 @@ class EtyperApp:
             self.scroll_offset = cursor_line - visible + 1
 
         display_lines = lines[self.scroll_offset:self.scroll_offset + visible]
-
-        # Draw text lines
-        y = MARGIN_Y
-        for line in display_lines:
-            draw.text((MARGIN_X, y), line, font=self.font, fill=0)
-            y += self.line_h
-
-        # Draw cursor block (full cell height to cover ascenders and descenders)
         vis_cursor_line = cursor_line - self.scroll_offset
-        if 0 <= vis_cursor_line < visible:
-            cx = MARGIN_X + cursor_col * self.char_w
-            cy = MARGIN_Y + vis_cursor_line * self.line_h
-
-            if cx + self.char_w <= PORTRAIT_W - MARGIN_X:
-                draw.rectangle(
-                    [cx, cy, cx + self.char_w - 1, cy + self.cell_h - 1],
-                    fill=0
-                )
-                # Draw the character under cursor in white (inverted)
-                if cursor_line < len(lines) and cursor_col < len(lines[cursor_line]):
-                    ch = lines[cursor_line][cursor_col]
-                    draw.text((cx, cy), ch, font=self.font, fill=1)
-
-        # Status bar
-        status_y = PORTRAIT_H - MARGIN_Y - self.cell_h
-        draw.line([(MARGIN_X, status_y - 2), (PORTRAIT_W - MARGIN_X, status_y - 2)], fill=0)
 
         doc_name = os.path.basename(self.doc_path) if self.doc_path else "untitled"
         save_indicator = "*" if self.dirty else ""
-        line_num = cursor_line + 1
-        col_num = cursor_col + 1
         status = f"{save_indicator}{doc_name}"
-        draw.text((MARGIN_X, status_y), status, font=self.font, fill=0)
+        status_y = PORTRAIT_H - MARGIN_Y - self.cell_h
+
+        rows, status_changed = self._diff_screen(
+            display_lines, (vis_cursor_line, cursor_col), status)
+
+        out = self._out
+        full = rows is None
+        if full:
+            self._fill_rect(out, 0, 0, PORTRAIT_W - 1, PORTRAIT_H - 1, 1)
+            self._fill_rect(out, MARGIN_X, status_y - 2, PORTRAIT_W - MARGIN_X, status_y - 2, 0)
+            rows = range(visible)
+            status_changed = True
+
+        # Redraw changed text rows
+        spans = []
+        for row in rows:
+            y = MARGIN_Y + row * self.line_h
+            spans.append((y, y + self.line_h - 1))
+            self._fill_rect(out, 0, y, PORTRAIT_W - 1, y + self.line_h - 1, 1)
+            if row < len(display_lines):
+                self._blit_text(out, MARGIN_X, y, display_lines[row])
+
+            # Draw cursor block (full cell height to cover ascenders and descenders)
+            if row == vis_cursor_line:
+                cx = MARGIN_X + cursor_col * self.char_w
+                if cx + self.char_w <= PORTRAIT_W - MARGIN_X:
+                    self._fill_rect(out, cx, y, cx + self.char_w - 1, y + self.cell_h - 1, 0)
+                    # Draw the character under cursor in white (inverted)
+                    if cursor_col < len(lines[cursor_line]):
+                        ch = lines[cursor_line][cursor_col]
+                        self._blit_text(out, cx, y, ch, fill=1)
 
-        # Rotate for landscape display
-        img_landscape = img.transpose(Image.Transpose.ROTATE_270)
-        return img_landscape
+        # Status bar
+        if status_changed:
+            spans.append((status_y, status_y + self.cell_h - 1))
+            self._fill_rect(out, 0, status_y, PORTRAIT_W - 1, status_y + self.cell_h - 1, 1)
+            self._blit_text(out, MARGIN_X, status_y, status)
+
+        # Portrait rows are panel columns: rows y0..y1 span landscape x H-1-y1..H-1-y0
+        if full:
+            self._dirty_window = None
+        elif spans:
+            y0 = min(a for a, _ in spans)
+            y1 = max(b for _, b in spans)
+            self._dirty_window = (PORTRAIT_H - 1 - y1, 0, PORTRAIT_H - 1 - y0, PORTRAIT_W - 1)
+        else:
+            self._dirty_window = ()
+        return self._pack(out)
+
+    def _diff_screen(self, display_lines, cursor_cell, status):
+        """Compare a frame against the previous render.
+
+        Returns (rows, status_changed) where rows is the set of visible rows
+        whose text or cursor changed, or None when the whole screen must be
+        redrawn (first frame or after scrolling).
+        """
+        prev = self._shown
+        self._shown = (self.scroll_offset, display_lines, cursor_cell, status)
+        if prev is None or prev[0] != self.scroll_offset:
+            return None, True
+
+        _, prev_lines, prev_cell, prev_status = prev
+        rows = set()
+        for i in range(max(len(prev_lines), len(display_lines))):
+            old = prev_lines[i] if i < len(prev_lines) else None
+            new = display_lines[i] if i < len(display_lines) else None
+            if old != new:
+                rows.add(i)
+        if prev_cell != cursor_cell:
+            rows.update(r for r in (prev_cell[0], cursor_cell[0])
+                        if 0 <= r < self.lines_per_page)
+        return rows, prev_status != status
+
+    def _display_partial(self, frame):
+        """Queue a partial refresh of the region the last render() marked dirty.
+
+        The SPI transfer and panel update run on the flusher thread, so the
+        main loop can keep reading keys meanwhile. Only the newest frame is
+        kept: a frame still waiting is replaced, and its window is merged
+        into the new one so no changed region is skipped.
+        """
+        window = self._dirty_window
+        if window == ():
+            return
+        try:
+            gen, _, old = self._flush_q.get_nowait()
+        except queue.Empty:
+            pass
+        else:
+            if gen == self._frame_gen and window is not None:
+                if old is None:
+                    window = None
+                else:
+                    window = (min(window[0], old[0]), min(window[1], old[1]),
+                              max(window[2], old[2]), max(window[3], old[3]))
+        self._flush_q.put((self._frame_gen, frame, window))
+
+    def _flusher(self):
+        """Flusher thread: send queued frames to the panel until stopped."""
+        while True:
+            item = self._flush_q.get()
+            if item is None:
+                return
+            gen, frame, window = item
+            with self._spi_lock:
+                if gen != self._frame_gen:
+                    continue  # superseded by a synchronous repaint
+                try:
+                    if window is None:
+                        self.epd.display_partial(frame)
+                    else:
+                        self.epd.display_window(frame, *window)
+                except Exception as e:
+                    print(f"Display update failed: {e}")
+
+    def _start_flusher(self):
+        self._flush_thread = threading.Thread(target=self._flusher, daemon=True)
+        self._flush_thread.start()
+
+    def _stop_flusher(self):
+        """Discard pending frames and wait for the flusher thread to exit."""
+        with self._spi_lock:
+            self._drop_frames()
+            self._flush_q.put(None)
+        self._flush_thread.join()
+        self._flush_thread = None
+
+    def _drop_frames(self):
+        """Discard frames the flusher has not shown yet.
+
+        Call with _spi_lock held before updating the panel directly; the
+        caller's repaint must cover the whole screen.
+        """
+        self._frame_gen += 1
+        try:
+            self._flush_q.get_nowait()
+        except queue.Empty:
+            pass
 
     # --- Cursor movement helpers ---
 
@@ -775,44 +1496,36 @@ class EtyperApp:
 
     def _pos_from_line_col(self, lines, target_line, target_col):
         """Convert a visual (line, col) back to a text character index."""
-        # Rebuild the text position by walking through paragraphs and wrapping
-        cpl = self.chars_per_line
-        text = self.text
-
-        line_idx = 0
-        text_pos = 0
-
-        for para in text.split("\n"):
-            if para == "":
-                if line_idx == target_line:
-                    return text_pos + min(target_col, 0)
-                line_idx += 1
-                text_pos += 1  # the \n character
-                continue
-
-            wrapped = textwrap.wrap(para, width=cpl,
-                                    break_long_words=True,
-                                    break_on_hyphens=False)
-            if not wrapped:
-                wrapped = [""]
+        return self._layout().position(target_line, target_col)
 
-            para_char = 0
-            for w_line in wrapped:
-                if line_idx == target_line:
-                    col = min(target_col, len(w_line))
-                    return text_pos + para_char + col
-                para_char += len(w_line)
-                # Skip the space consumed by wrapping
-                if para_char < len(para) and para[para_char] == " ":
-                    para_char += 1
-                line_idx += 1
-
-            text_pos += len(para) + 1  # +1 for \n
+    # --- Keyboard input ---
 
-        # Past end of text
-        return len(text)
+    def _build_dispatch(self):
+        """Map keycodes to their handlers, once, so _handle_key is one lookup."""
+        if not HAS_EVDEV:
+            return
 
-    # --- Keyboard input ---
+        self._ctrl_dispatch = {
+            ecodes.KEY_Q: self._k_sleep,
+            ecodes.KEY_S: self._k_save,
+            ecodes.KEY_N: self.new_document,
+            ecodes.KEY_R: self._k_refresh,
+            ecodes.KEY_LEFT: functools.partial(self._switch_document, -1),
+            ecodes.KEY_RIGHT: functools.partial(self._switch_document, +1),
+            ecodes.KEY_F: self._file_server_mode,
+            ecodes.KEY_K: self._show_layout_picker,
+        }
+        self._dispatch = {
+            ecodes.KEY_LEFT: self._k_left,
+            ecodes.KEY_RIGHT: self._k_right,
+            ecodes.KEY_UP: self._k_up,
+            ecodes.KEY_DOWN: self._k_down,
+            ecodes.KEY_HOME: self._k_home,
+            ecodes.KEY_END: self._k_end,
+            ecodes.KEY_ENTER: self._k_enter,
+            ecodes.KEY_BACKSPACE: self._k_backspace,
+            ecodes.KEY_DELETE: self._k_delete,
+        }
 
     def _handle_key(self, keycode, value):
         """Process a keyboard event."""
@@ -828,107 +1541,87 @@ class EtyperApp:
         if value == 0:
             return
 
-        # Ctrl shortcuts
-        if self.ctrl_held:
-            if keycode == ecodes.KEY_Q:
-                self.save_document()
-                self._sleep_mode()
-                return
-            elif keycode == ecodes.KEY_S:
-                self.save_document()
-                self.needs_display_update = True
-                return
-            elif keycode == ecodes.KEY_N:
-                self.new_document()
-                return
-            elif keycode == ecodes.KEY_R:
-                # Force full refresh
-                img = self.render()
-                self.epd.full_refresh(list(img.tobytes()))
-                self.needs_display_update = False
-                return
-            elif keycode == ecodes.KEY_LEFT:
-                self._switch_document(-1)
-                return
-            elif keycode == ecodes.KEY_RIGHT:
-                self._switch_document(+1)
-                return
-            elif keycode == ecodes.KEY_F:
-                self._file_server_mode()
-                return
-            elif keycode == ecodes.KEY_K:
-                self._show_layout_picker()
-                return
+        # Ctrl shortcuts first; unbound Ctrl combos act like the plain key
+        handler = self.ctrl_held and self._ctrl_dispatch.get(keycode)
+        handler = handler or self._dispatch.get(keycode)
+        if handler:
+            handler()
+        else:
+            self._k_char(keycode)
 
-        # Arrow keys
-        if keycode == ecodes.KEY_LEFT:
-            if self.cursor > 0:
-                self.cursor -= 1
-                self.needs_display_update = True
-            return
+    # Ctrl shortcuts
 
-        if keycode == ecodes.KEY_RIGHT:
-            if self.cursor < len(self.text):
-                self.cursor += 1
-                self.needs_display_update = True
-            return
+    def _k_sleep(self):
+        self.save_document()
+        self._sleep_mode()
 
-        if keycode == ecodes.KEY_UP:
-            self._cursor_up()
-            self.needs_display_update = True
-            return
+    def _k_save(self):
+        self.save_document()
+        self.needs_display_update = True
 
-        if keycode == ecodes.KEY_DOWN:
-            self._cursor_down()
-            self.needs_display_update = True
-            return
+    def _k_refresh(self):
+        # Force full refresh
+        with self._spi_lock:
+            self._drop_frames()
+            self.epd.full_refresh(self.render())
+        self.needs_display_update = False
 
-        if keycode == ecodes.KEY_HOME:
-            # Move to start of current visual line
-            lines, cur_line, _ = self._wrap_with_cursor()
-            self.cursor = self._pos_from_line_col(lines, cur_line, 0)
-            self.needs_display_update = True
-            return
+    # Cursor movement
 
-        if keycode == ecodes.KEY_END:
-            # Move to end of current visual line
-            lines, cur_line, _ = self._wrap_with_cursor()
-            self.cursor = self._pos_from_line_col(lines, cur_line, len(lines[cur_line]))
+    def _k_left(self):
+        if self.cursor > 0:
+            self.cursor -= 1
             self.needs_display_update = True
-            return
 
-        # Enter
-        if keycode == ecodes.KEY_ENTER:
-            self.text = self.text[:self.cursor] + "\n" + self.text[self.cursor:]
+    def _k_right(self):
+        if self.cursor < len(self.buf):
             self.cursor += 1
-            self.dirty = True
             self.needs_display_update = True
-            return
 
-        # Backspace
-        if keycode == ecodes.KEY_BACKSPACE:
-            if self.cursor > 0:
-                self.text = self.text[:self.cursor - 1] + self.text[self.cursor:]
-                self.cursor -= 1
-                self.dirty = True
-                self.needs_display_update = True
-            return
+    def _k_up(self):
+        self._cursor_up()
+        self.needs_display_update = True
 
-        # Delete
-        if keycode == ecodes.KEY_DELETE:
-            if self.cursor < len(self.text):
-                self.text = self.text[:self.cursor] + self.text[self.cursor + 1:]
-                self.dirty = True
-                self.needs_display_update = True
-            return
+    def _k_down(self):
+        self._cursor_down()
+        self.needs_display_update = True
+
+    def _k_home(self):
+        # Move to start of current visual line
+        lines, cur_line, _ = self._wrap_with_cursor()
+        self.cursor = self._pos_from_line_col(lines, cur_line, 0)
+        self.needs_display_update = True
+
+    def _k_end(self):
+        # Move to end of current visual line
+        lines, cur_line, _ = self._wrap_with_cursor()
+        self.cursor = self._pos_from_line_col(lines, cur_line, len(lines[cur_line]))
+        self.needs_display_update = True
+
+    # Editing
+
+    def _k_enter(self):
+        self._replace_text(self.cursor, self.cursor, "\n")
+        self.cursor += 1
+        self.needs_display_update = True
+
+    def _k_backspace(self):
+        if self.cursor > 0:
+            self._replace_text(self.cursor - 1, self.cursor, "")
+            self.cursor -= 1
+            self.needs_display_update = True
+
+    def _k_delete(self):
+        if self.cursor < len(self.buf):
+            self._replace_text(self.cursor, self.cursor + 1, "")
+            self.needs_display_update = True
 
+    def _k_char(self, keycode):
         # Regular characters - insert at cursor position
-        if keycode in self.keymap:
-            normal, shifted = self.keymap[keycode]
-            char = shifted if self.shift_held else normal
-            self.text = self.text[:self.cursor] + char + self.text[self.cursor:]
+        char = self.key_tables[self.shift_held][keycode]
+        if char is not None:
+            self._replace_text(self.cursor, self.cursor, char)
             self.cursor += len(char)
-            self.dirty = True
             self.needs_display_update = True
 
     # --- Sleep / wake ---
@@ -939,19 +1632,19 @@ class EtyperApp:
 
         # Show goodbye screen
         if self.epd:
-            try:
-                self.epd.init()
-                img = Image.new("1", (PORTRAIT_W, PORTRAIT_H), 255)
-                draw = ImageDraw.Draw(img)
-                draw.text((PORTRAIT_W // 2 - 70, PORTRAIT_H // 2 - 10),
-                          "Saved. Goodbye.", font=self.font, fill=0)
-                draw.text((PORTRAIT_W // 2 - 80, PORTRAIT_H // 2 + 20),
-                          "Ctrl+Q to resume", font=self.font, fill=0)
-                img_landscape = img.transpose(Image.Transpose.ROTATE_270)
-                self.epd.display(list(img_landscape.tobytes()))
-                self.epd.sleep()
-            except Exception:
-                pass
+            img = self._new_screen()
+            self._blit_text(img, PORTRAIT_W // 2 - 70, PORTRAIT_H // 2 - 10,
+                            "Saved. Goodbye.")
+            self._blit_text(img, PORTRAIT_W // 2 - 80, PORTRAIT_H // 2 + 20,
+                            "Ctrl+Q to resume")
+            with self._spi_lock:
+                self._drop_frames()
+                try:
+                    self.epd.init()
+                    self.epd.display(self._pack(img))
+                    self.epd.sleep()
+                except Exception:
+                    pass
 
         # Wait for Ctrl+Q on keyboard
         print("Sleeping. Press Ctrl+Q to wake up...")
@@ -959,10 +1652,10 @@ class EtyperApp:
 
         # Wake up: reinitialize display and resume
         print("Waking up...")
-        self.epd.init()
-        img = self.render()
-        self.epd.display(list(img.tobytes()))
-        self.epd.init_partial()
+        with self._spi_lock:
+            self.epd.init()
+            self.epd.display(self.render())
+            self.epd.init_fast()
         self.needs_display_update = False
         print("Resumed.")
 
@@ -970,14 +1663,11 @@ class EtyperApp:
         """Block until Ctrl+Q is pressed again on the keyboard."""
         ctrl_held = False
         while self.running:
-            if self.keyboard is None:
-                self.keyboard = self._find_keyboard()
-                if self.keyboard is None:
-                    time.sleep(1)
-                    continue
+            if not self._ensure_keyboard():
+                self._poll_keyboard(1.0)
+                continue
             try:
-                r, _, _ = select.select([self.keyboard.fd], [], [], 1.0)
-                if not r:
+                if not self._poll_keyboard(1.0):
                     continue
                 for event in self.keyboard.read():
                     if event.type != ecodes.EV_KEY:
@@ -987,7 +1677,7 @@ class EtyperApp:
                     elif event.code == ecodes.KEY_Q and event.value == 1 and ctrl_held:
                         return
             except OSError:
-                self.keyboard = None
+                self._detach_keyboard()
                 time.sleep(1)
 
     # --- File server mode (Bluetooth PAN) ---
@@ -1011,27 +1701,27 @@ class EtyperApp:
         timeout_min = self.BT_PAN_TIMEOUT // 60
 
         # Show instructions on e-paper
-        self.epd.init()
-        img = Image.new("1", (PORTRAIT_W, PORTRAIT_H), 255)
-        draw = ImageDraw.Draw(img)
+        img = self._new_screen()
 
         y = MARGIN_Y + 10
-        draw.text((MARGIN_X, y), "-- File Server --", font=self.font, fill=0)
+        self._blit_text(img, MARGIN_X, y, "-- File Server --")
         y += self.line_h * 2
-        draw.text((MARGIN_X, y), "1. Pair Bluetooth", font=self.font, fill=0)
+        self._blit_text(img, MARGIN_X, y, "1. Pair Bluetooth")
         y += self.line_h
-        draw.text((MARGIN_X, y), "   with \"etyper\"", font=self.font, fill=0)
+        self._blit_text(img, MARGIN_X, y, "   with \"etyper\"")
         y += self.line_h * 2
-        draw.text((MARGIN_X, y), "2. Open browser:", font=self.font, fill=0)
+        self._blit_text(img, MARGIN_X, y, "2. Open browser:")
         y += self.line_h
-        draw.text((MARGIN_X, y), f"   {url}", font=self.font, fill=0)
+        self._blit_text(img, MARGIN_X, y, f"   {url}")
         y += self.line_h * 2
-        draw.text((MARGIN_X, y), f"Auto-off: {timeout_min} min", font=self.font, fill=0)
+        self._blit_text(img, MARGIN_X, y, f"Auto-off: {timeout_min} min")
         y += self.line_h
-        draw.text((MARGIN_X, y), "Ctrl+F to stop", font=self.font, fill=0)
+        self._blit_text(img, MARGIN_X, y, "Ctrl+F to stop")
 
-        img_landscape = img.transpose(Image.Transpose.ROTATE_270)
-        self.epd.display(list(img_landscape.tobytes()))
+        with self._spi_lock:
+            self._drop_frames()
+            self.epd.init()
+            self.epd.display(self._pack(img))
 
         # Start Bluetooth PAN and file server
         bt_state = self._start_bt_pan()
@@ -1077,10 +1767,11 @@ class EtyperApp:
     def _resume_typewriter_display(self):
         """Reinitialize display and show typewriter screen."""
         time.sleep(1)
-        self.epd.init()
-        img = self.render()
-        self.epd.display(list(img.tobytes()))
-        self.epd.init_partial()
+        with self._spi_lock:
+            self._drop_frames()
+            self.epd.init()
+            self.epd.display(self.render())
+            self.epd.init_fast()
         self.needs_display_update = False
 
     def _start_bt_pan(self):
@@ -1476,14 +2167,11 @@ class EtyperApp:
             if timeout > 0 and time.time() - start >= timeout:
                 print("Timeout reached.")
                 return
-            if self.keyboard is None:
-                self.keyboard = self._find_keyboard()
-                if self.keyboard is None:
-                    time.sleep(1)
-                    continue
+            if not self._ensure_keyboard():
+                self._poll_keyboard(1.0)
+                continue
             try:
-                r, _, _ = select.select([self.keyboard.fd], [], [], 1.0)
-                if not r:
+                if not self._poll_keyboard(1.0):
                     continue
                 for event in self.keyboard.read():
                     if event.type != ecodes.EV_KEY:
@@ -1493,7 +2181,7 @@ class EtyperApp:
                     elif event.code == target_key and event.value == 1 and ctrl_held:
                         return
             except OSError:
-                self.keyboard = None
+                self._detach_keyboard()
                 time.sleep(1)
 
     # --- Main loop ---
@@ -1511,6 +2199,7 @@ class EtyperApp:
 
         self.font = self._find_font()
         self._calc_text_metrics()
+        self._setup_canvas()
         print(f"Text area: {self.chars_per_line} chars x {self.lines_per_page} lines")
 
         self._load_layout_pref()
@@ -1518,11 +2207,14 @@ class EtyperApp:
 
         print("Initial display refresh...")
         self.epd.init()
-        img = self.render()
-        self.epd.display(list(img.tobytes()))
-        self.epd.init_partial()
+        self.epd.display(self.render())
+        self.epd.init_fast()
 
-        self.keyboard = self._find_keyboard()
+        self._epoll = select.epoll()
+        if HAS_PYUDEV:
+            self._start_hotplug_monitor()
+        self._ensure_keyboard()
+        self._start_flusher()
 
         self.running = True
         self.last_save_time = time.time()
@@ -1544,58 +2236,57 @@ class EtyperApp:
     def _main_loop(self):
         """Event loop: read keyboard, update display, autosave."""
         while self.running:
-            if self.keyboard is None:
-                self.keyboard = self._find_keyboard()
-                if self.keyboard is None:
-                    time.sleep(1)
-                    self._check_autosave()
-                    continue
+            if not self._ensure_keyboard():
+                self._poll_keyboard(1.0)
+                self._check_autosave()
+                continue
 
             try:
-                r, _, _ = select.select([self.keyboard.fd], [], [], 0.5)
-
-                if r:
+                if self._poll_keyboard(0.5):
                     for event in self.keyboard.read():
                         if event.type == ecodes.EV_KEY:
                             self._handle_key(event.code, event.value)
 
                 if self.needs_display_update:
-                    img = self.render()
-                    self.epd.display_image_partial(img)
+                    self._display_partial(self.render())
                     self.needs_display_update = False
 
                 self._check_autosave()
 
             except OSError:
                 print("Keyboard disconnected, waiting...")
-                self.keyboard = None
+                self._detach_keyboard()
                 time.sleep(1)
 
     def _check_autosave(self):
         if self.dirty and (time.time() - self.last_save_time >= AUTOSAVE_INTERVAL):
-            self.save_document()
+            self._write_journal()
             print(f"Autosaved: {self.doc_path}")
 
     def _shutdown(self):
         print("\nShutting down...")
-        if self.dirty:
-            self.save_document()
+        if self.dirty or self._journal_size:
+            self.save_document(sync=True)
             print(f"Saved: {self.doc_path}")
 
+        if self._flush_thread:
+            self._stop_flusher()
+
         if self.epd:
             try:
                 self.epd.init()
-                img = Image.new("1", (PORTRAIT_W, PORTRAIT_H), 255)
-                draw = ImageDraw.Draw(img)
-                draw.text((PORTRAIT_W // 2 - 60, PORTRAIT_H // 2 - 10),
-                          "Saved. Goodbye.", font=self.font, fill=0)
-                img_landscape = img.transpose(Image.Transpose.ROTATE_270)
-                self.epd.display(list(img_landscape.tobytes()))
+                img = self._new_screen()
+                self._blit_text(img, PORTRAIT_W // 2 - 60, PORTRAIT_H // 2 - 10,
+                                "Saved. Goodbye.")
+                self.epd.display(self._pack(img))
                 self.epd.sleep()
             except Exception:
                 pass
             self.epd.close()
 
+        if self._epoll:
+            self._epoll.close()
+
         print("Done.")
 
 